@@ -1,32 +1,42 @@
 import asyncio
 from spade.agent import Agent
-from spade.behaviour import CyclicBehaviour
+from spade.behaviour import PeriodicBehaviour
 
 
 class AgentOne(Agent):
     """A basic SPADE agent that prints a message periodically"""
-    
-    class HelloBehaviour(CyclicBehaviour):
-        def __init__(self):
-            super().__init__()
+
+    class HelloBehaviour(PeriodicBehaviour):
+        def __init__(self, period):
+            super().__init__(period=period)
             self.counter = 0
-        
+
+        async def on_start(self):
+            # the name never changes, so don't re-resolve it every run
+            self._name = self.agent.name
+
         async def run(self):
             self.counter += 1
-            print(f"[{self.agent.name}] Agent running and saying hello! (Count: {self.counter})")
-            
+            print(f"[{self._name}] Agent running and saying hello! (Count: {self.counter})")
+
             # so it doesn't run forever
             if self.counter >= 5:
-                print(f"[{self.agent.name}] Stopping agent after {self.counter} iterations")
+                print(f"[{self._name}] Stopping agent after {self.counter} iterations")
                 await self.agent.stop()
-            
-            await asyncio.sleep(2)
-    
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stopped = asyncio.Event()
+
     async def setup(self):
         print(f"[{self.name}] Agent setup started")
-        self.add_behaviour(self.HelloBehaviour())
+        self.add_behaviour(self.HelloBehaviour(period=2))
         print(f"[{self.name}] Agent setup completed")
 
+    async def stop(self):
+        self.stopped.set()
+        await super().stop()
+
 
 async def main():
     print("="*60)
@@ -38,12 +48,20 @@ async def main():
     await agent.start()
     print("[INFO] Agent started successfully!\n")
     
-    while agent.is_alive():
-        await asyncio.sleep(1)
+    await agent.stopped.wait()
     
     print("\n[INFO] Agent has stopped")
     print("="*60)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # Reuse an existing event loop when one is available (notebooks,
+    # warm restarts) instead of tearing one down and rebuilding it
+    try:
+        loop = asyncio.get_event_loop()
+        if loop.is_running():
+            loop.create_task(main())
+        else:
+            loop.run_until_complete(main())
+    except RuntimeError:
+        asyncio.run(main())
\ No newline at end of file
@@ -1,10 +1,20 @@
 import asyncio
 import random
-from datetime import datetime
+import time
+import numpy as np
 from spade.agent import Agent
 from spade.behaviour import PeriodicBehaviour
 
 
+# Indices into the environment state vector
+TEMPERATURE, HUMIDITY, WIND_SPEED, WATER_LEVEL, STRUCTURAL_DAMAGE = range(5)
+
+
+def _now_str():
+    # time.strftime skips the datetime object allocation
+    return time.strftime("%Y-%m-%d %H:%M:%S")
+
+
 class DisasterEnvironment:
     """
     Simulates a disaster environment with various conditions.
@@ -23,54 +33,72 @@ class DisasterEnvironment:
         
         self.severity_levels = ["Low", "Medium", "High", "Critical"]
         
-        # Environmental parameters
-        self.temperature = 25.0  # Celsius
-        self.humidity = 50.0     # Percentage
-        self.wind_speed = 10.0   # km/h
-        self.water_level = 0.0   # meters
-        self.structural_damage = 0.0  # Percentage
-    
+        # Environmental parameters: temperature (Celsius), humidity (%),
+        # wind speed (km/h), water level (m), structural damage (%)
+        self.state = np.array([25.0, 50.0, 10.0, 0.0, 0.0])
+
+        # Per-tick drift and clamp bounds for the whole state vector
+        self._drift_low = np.array([-2.0, -5.0, -3.0, -0.5, 0.0])
+        self._drift_high = np.array([2.0, 5.0, 3.0, 0.5, 2.0])
+        self._clip_low = np.zeros(5)
+        self._clip_high = np.array([50.0, 100.0, 150.0, 10.0, 100.0])
+        self._rng = np.random.default_rng()
+
+        # Pregenerated (type index, severity index, zone) draws consumed
+        # one row per disaster event, refilled in bulk
+        self._draw_low = np.array([0, 0, 1])
+        self._draw_high = np.array(
+            [len(self.disaster_types), len(self.severity_levels), 11]
+        )
+        self._event_draws = iter(
+            self._rng.integers(self._draw_low, self._draw_high, size=(256, 3))
+        )
+
     def update_conditions(self):
         """
         Randomly update environmental conditions.
         Simulates changing environment over time.
         """
-        self.temperature += random.uniform(-2, 2)
-        self.humidity += random.uniform(-5, 5)
-        self.wind_speed += random.uniform(-3, 3)
-        self.water_level += random.uniform(-0.5, 0.5)
-        self.structural_damage += random.uniform(0, 2)
-        
-        # reasonable ranges
-        self.temperature = max(0, min(50, self.temperature))
-        self.humidity = max(0, min(100, self.humidity))
-        self.wind_speed = max(0, min(150, self.wind_speed))
-        self.water_level = max(0, min(10, self.water_level))
-        self.structural_damage = max(0, min(100, self.structural_damage))
+        # one vectorized draw + clip instead of five scalar updates
+        drift = self._rng.uniform(self._drift_low, self._drift_high)
+        self.state = np.clip(self.state + drift, self._clip_low, self._clip_high)
     
+    def _next_event_draw(self):
+        """
+        Next pregenerated (type index, severity index, zone) row.
+        """
+        try:
+            return next(self._event_draws)
+        except StopIteration:
+            self._event_draws = iter(
+                self._rng.integers(self._draw_low, self._draw_high, size=(256, 3))
+            )
+            return next(self._event_draws)
+
     def generate_disaster_event(self):
         """
         Generate a random disaster event.
         Returns a dictionary with disaster details.
         """
-        disaster_type = random.choice(self.disaster_types)
-        severity = random.choice(self.severity_levels)
+        type_idx, severity_idx, zone = self._next_event_draw()
+        disaster_type = self.disaster_types[type_idx]
+        severity = self.severity_levels[severity_idx]
         
         # adjust based on disaster
         if disaster_type == "Fire":
-            self.temperature += random.uniform(5, 15)
+            self.state[TEMPERATURE] += random.uniform(5, 15)
         elif disaster_type == "Flood":
-            self.water_level += random.uniform(1, 3)
+            self.state[WATER_LEVEL] += random.uniform(1, 3)
         elif disaster_type in ["Hurricane", "Tornado"]:
-            self.wind_speed += random.uniform(20, 50)
+            self.state[WIND_SPEED] += random.uniform(20, 50)
         elif disaster_type == "Earthquake":
-            self.structural_damage += random.uniform(5, 20)
+            self.state[STRUCTURAL_DAMAGE] += random.uniform(5, 20)
         
         return {
             "type": disaster_type,
             "severity": severity,
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "location": f"Zone-{random.randint(1, 10)}"
+            "timestamp": _now_str(),
+            "location": f"Zone-{zone}"
         }
     
     def get_current_state(self):
@@ -78,10 +106,10 @@ class DisasterEnvironment:
         Returns current environmental state.
         """
         return {
-            "temperature": round(self.temperature, 2),
-            "humidity": round(self.humidity, 2),
-            "wind_speed": round(self.wind_speed, 2),
-            "water_level": round(self.water_level, 2),
-            "structural_damage": round(self.structural_damage, 2)
+            "temperature": round(float(self.state[TEMPERATURE]), 2),
+            "humidity": round(float(self.state[HUMIDITY]), 2),
+            "wind_speed": round(float(self.state[WIND_SPEED]), 2),
+            "water_level": round(float(self.state[WATER_LEVEL]), 2),
+            "structural_damage": round(float(self.state[STRUCTURAL_DAMAGE]), 2)
         }
 
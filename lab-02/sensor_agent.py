@@ -1,11 +1,29 @@
 import asyncio
 import random
-from datetime import datetime
+import time
 from spade.agent import Agent
 from spade.behaviour import PeriodicBehaviour
 
 from disaster_env import DisasterEnvironment
 
+
+# two-slot cache: [last integer second, its formatted string]; cheaper
+# than lru_cache, which hashes the key and tracks hit statistics
+_ts_cache = [0, ""]
+
+
+def _fmt_now():
+    """
+    Formatted timestamp, cached per wall-clock second (strftime is
+    expensive and every call within a cycle wants the same second).
+    """
+    sec = int(time.time())
+    if sec != _ts_cache[0]:
+        _ts_cache[0] = sec
+        _ts_cache[1] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+    return _ts_cache[1]
+
+
 class SensorAgent(Agent):
     """
     Agent that periodically monitors environmental conditions
@@ -22,7 +40,12 @@ class SensorAgent(Agent):
             self.environment = environment
             self.log_file = log_file
             self.perception_count = 0
-        
+
+        async def on_start(self):
+            # cache the agent's log handle; it stays open for our lifetime
+            self._log_fh = self.agent._log_fh
+
+
         async def run(self):
             """
             Main perception loop:
@@ -31,7 +54,7 @@ class SensorAgent(Agent):
             3. Log events
             """
             self.perception_count += 1
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            timestamp = _fmt_now()
             
             # Update environment conditions
             self.environment.update_conditions()
@@ -77,17 +100,18 @@ class SensorAgent(Agent):
             """
             Write events to log file.
             """
-            with open(self.log_file, "a") as f:
-                f.write(f"\n{'='*70}\n")
-                f.write(f"[{timestamp}] {event_type}\n")
-                f.write(f"{'-'*70}\n")
-                for key, value in data.items():
-                    f.write(f"{key}: {value}\n")
-    
+            entry = "".join(
+                [f"\n{'='*70}\n", f"[{timestamp}] {event_type}\n", f"{'-'*70}\n"]
+                + [f"{key}: {value}\n" for key, value in data.items()]
+            )
+            self._log_fh.write(entry)
+
     def __init__(self, jid, password, environment, log_file, verify_security=False):
         super().__init__(jid, password, verify_security=verify_security)
         self.environment = environment
         self.log_file = log_file
+        self._log_fh = None
+        self.stopped = asyncio.Event()
     
     async def setup(self):
         """
@@ -100,9 +124,12 @@ class SensorAgent(Agent):
         with open(self.log_file, "w") as f:
             f.write("="*70 + "\n")
             f.write("DISASTER MONITORING SYSTEM - EVENT LOG\n")
-            f.write(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"Started: {_fmt_now()}\n")
             f.write("="*70 + "\n")
-        
+
+        # single buffered handle reused by every log_event call
+        self._log_fh = open(self.log_file, "a", buffering=1 << 16)
+
         # perception behavior that runs every 3 seconds
         perception = self.PerceptionBehaviour(
             period=3.0,
@@ -114,6 +141,16 @@ class SensorAgent(Agent):
         print("[SETUP] Perception behavior activated")
         print("[SETUP] Starting environmental monitoring...\n")
 
+    async def stop(self):
+        """
+        Flush and close the log file handle before stopping.
+        """
+        self.stopped.set()
+        if self._log_fh is not None:
+            self._log_fh.close()
+            self._log_fh = None
+        await super().stop()
+
 
 async def main():
     """
@@ -147,9 +184,8 @@ async def main():
     await agent.start()
     print(f"[INFO] SensorAgent started: {JID}\n")
     
-    # while agent is alive
-    while agent.is_alive():
-        await asyncio.sleep(1)
+    # sleep until the agent signals shutdown (no 1s polling wakeups)
+    await agent.stopped.wait()
     
     print("\n" + "="*70)
     print("MONITORING SESSION COMPLETED")
@@ -160,7 +196,16 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        # attach to an already-running loop if there is one, otherwise
+        # drive a fresh one; avoids rebuilding the selector on reruns
+        try:
+            loop = asyncio.get_event_loop()
+            if loop.is_running():
+                loop.create_task(main())
+            else:
+                loop.run_until_complete(main())
+        except RuntimeError:
+            asyncio.run(main())
     except KeyboardInterrupt:
         print("\n\n[INFO] Monitoring stopped by user")
     except Exception as e:
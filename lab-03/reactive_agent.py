@@ -10,40 +10,112 @@ This program implements:
 """
 
 import asyncio
-import random
-from datetime import datetime
-from enum import Enum
+import sys
+import time
+from collections import deque
+import numpy as np
 from spade.agent import Agent
-from spade.behaviour import CyclicBehaviour
+from spade.behaviour import PeriodicBehaviour
 
 
-# ============================================================================
-# FSM STATES AND GOALS
-# ============================================================================
+# two-slot cache: [last integer second, its formatted string]; cheaper
+# than lru_cache, which hashes the key and tracks hit statistics
+_ts_cache = [0, ""]
+
 
-class AgentState(Enum):
+def _fmt_now():
     """
-    Finite State Machine states for the rescue agent.
+    Formatted timestamp cached per wall-clock second, so repeated
+    calls within one FSM cycle skip the strftime machinery.
     """
-    IDLE = "IDLE"
-    MONITORING = "MONITORING"
-    ASSESSING = "ASSESSING"
-    RESPONDING = "RESPONDING"
-    RESCUING = "RESCUING"
-    EVACUATING = "EVACUATING"
-    RECOVERY = "RECOVERY"
+    sec = int(time.time())
+    if sec != _ts_cache[0]:
+        _ts_cache[0] = sec
+        _ts_cache[1] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+    return _ts_cache[1]
 
 
-class Goal(Enum):
-    """
-    Agent goals for disaster response.
-    """
-    MAINTAIN_SAFETY = "Maintain Safety"
-    DETECT_DISASTERS = "Detect Disasters"
-    ASSESS_DAMAGE = "Assess Damage"
-    RESCUE_VICTIMS = "Rescue Victims"
-    EVACUATE_AREA = "Evacuate Area"
-    COORDINATE_RESPONSE = "Coordinate Response"
+# ============================================================================
+# FSM STATES AND GOALS
+# ============================================================================
+
+# Finite State Machine states for the rescue agent. Plain ints compare at
+# C speed in the FSM hot path; STATE_NAMES holds the display strings.
+IDLE, MONITORING, ASSESSING, RESPONDING, RESCUING, EVACUATING, RECOVERY = range(7)
+
+STATE_NAMES = (
+    "IDLE",
+    "MONITORING",
+    "ASSESSING",
+    "RESPONDING",
+    "RESCUING",
+    "EVACUATING",
+    "RECOVERY",
+)
+
+# Agent goals for disaster response
+(MAINTAIN_SAFETY, DETECT_DISASTERS, ASSESS_DAMAGE,
+ RESCUE_VICTIMS, EVACUATE_AREA, COORDINATE_RESPONSE) = range(6)
+
+GOAL_NAMES = (
+    "Maintain Safety",
+    "Detect Disasters",
+    "Assess Damage",
+    "Rescue Victims",
+    "Evacuate Area",
+    "Coordinate Response",
+)
+
+# States whose next transition hinges on a random completion roll, so
+# they are resolved by _response_progress instead of FSM_TRANSITIONS
+ACTIVE_RESPONSE_STATES = frozenset({RESPONDING, RESCUING, EVACUATING})
+
+_BANNER = "=" * 70
+
+# Precomputed (state, severity) -> (next state, next goal, message) table;
+# "*" matches any severity. Active-response states are absent because their
+# outcome depends on a random completion roll, not a static transition.
+FSM_TRANSITIONS = {
+    (IDLE, "*"): (ASSESSING, ASSESS_DAMAGE, "  IDLE → ASSESSING"),
+    (MONITORING, "*"): (ASSESSING, ASSESS_DAMAGE, "  MONITORING → ASSESSING"),
+    (ASSESSING, "Critical"): (RESCUING, RESCUE_VICTIMS, "  ASSESSING → RESCUING (Critical severity)"),
+    (ASSESSING, "High"): (EVACUATING, EVACUATE_AREA, "  ASSESSING → EVACUATING (High severity)"),
+    (ASSESSING, "Medium"): (RESPONDING, COORDINATE_RESPONSE, "  ASSESSING → RESPONDING (Medium severity)"),
+    (RECOVERY, "*"): (MONITORING, DETECT_DISASTERS, "  RECOVERY → MONITORING (Recovery complete)"),
+}
+
+# Trace lines emitted by execute_state_behavior for each state
+STATE_ACTIONS = {
+    MONITORING: (
+        "  → Monitoring environment for disasters",
+        "  → Running sensor scans",
+    ),
+    ASSESSING: (
+        "  → Analyzing disaster impact",
+        "  → Determining response priority",
+        "  → Calculating resource requirements",
+    ),
+    RESPONDING: (
+        "  → Deploying emergency response teams",
+        "  → Establishing communication channels",
+        "  → Coordinating with other agents",
+    ),
+    RESCUING: (
+        "  → Locating victims",
+        "  → Deploying rescue teams",
+        "  → Providing medical assistance",
+    ),
+    EVACUATING: (
+        "  → Issuing evacuation orders",
+        "  → Opening evacuation routes",
+        "  → Guiding civilians to safety",
+    ),
+    RECOVERY: (
+        "  → Assessing residual risks",
+        "  → Coordinating cleanup operations",
+        "  → Preparing for next incident",
+    ),
+}
 
 
 # ============================================================================
@@ -54,413 +126,123 @@ class DisasterEvent:
     """
     Represents a disaster event that triggers agent behavior.
     """
-    def __init__(self, event_type, severity, location):
+    def __init__(self, event_type, severity, location, timestamp=None):
         self.event_type = event_type
         self.severity = severity
         self.location = location
-        self.timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # only format a fresh timestamp when the caller didn't pass one
+        self.timestamp = timestamp if timestamp is not None else _fmt_now()
     
     def __str__(self):
         return f"{self.event_type} (Severity: {self.severity}) at {self.location}"
 
 
-class SensorReport:
-    """
-    Environmental sensor report that can trigger events.
-    """
-    def __init__(self):
-        self.temperature = random.uniform(20, 45)
-        self.wind_speed = random.uniform(0, 120)
-        self.water_level = random.uniform(0, 8)
-        self.structural_damage = random.uniform(0, 100)
-        self.timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    def detect_disaster(self):
-        """
-        Analyze sensor data to detect disaster events.
-        Returns DisasterEvent or None.
-        """
-        # Check for fire (high temperature)
-        if self.temperature > 40:
-            return DisasterEvent("Fire", self._get_severity(self.temperature, 40, 50), "Fire Zone")
-        
-        # Check for flood (high water level)
-        if self.water_level > 5:
-            return DisasterEvent("Flood", self._get_severity(self.water_level, 5, 10), "Flood Zone")
-        
-        # Check for hurricane (high wind speed)
-        if self.wind_speed > 80:
-            return DisasterEvent("Hurricane", self._get_severity(self.wind_speed, 80, 120), "Storm Zone")
-        
-        # Check for structural collapse (high damage)
-        if self.structural_damage > 60:
-            return DisasterEvent("Building Collapse", self._get_severity(self.structural_damage, 60, 100), "Collapse Zone")
-        
-        return None
-    
-    def _get_severity(self, value, min_threshold, max_threshold):
-        """
-        Calculate severity level based on sensor value.
-        """
-        range_size = max_threshold - min_threshold
-        position = (value - min_threshold) / range_size
-        
-        if position < 0.33:
-            return "Medium"
-        elif position < 0.66:
-            return "High"
-        else:
-            return "Critical"
+SEVERITY_LEVELS = ("Medium", "High", "Critical")
+SEVERITY_RANK = {name: rank for rank, name in enumerate(SEVERITY_LEVELS)}
 
+# (attribute, threshold, event type, location, sensor max) per disaster check
+DISASTER_CHECKS = (
+    ("temperature", 40, "Fire", "Fire Zone", 50),
+    ("water_level", 5, "Flood", "Flood Zone", 10),
+    ("wind_speed", 80, "Hurricane", "Storm Zone", 120),
+    ("structural_damage", 60, "Building Collapse", "Collapse Zone", 100),
+)
 
-# ============================================================================
-# REACTIVE AGENT WITH FSM
-# ============================================================================
+# Sample column order: temperature, wind speed, water level, structural damage
+SENSOR_LOWS = np.array([20.0, 0.0, 0.0, 0.0])
+SENSOR_HIGHS = np.array([45.0, 120.0, 8.0, 100.0])
 
-class ReactiveRescueAgent(Agent):
-    """
-    Rescue agent with Finite State Machine for reactive behavior.
-    """
-    
-    class FSMBehaviour(CyclicBehaviour):
-        """
-        FSM-based behavior that reacts to events and pursues goals.
-        """
-        
-        def __init__(self, trace_file):
-            super().__init__()
-            self.state = AgentState.IDLE
-            self.current_goal = Goal.MAINTAIN_SAFETY
-            self.trace_file = trace_file
-            self.cycle_count = 0
-            self.event_queue = []
-        
-        async def run(self):
-            """
-            Main FSM loop: sense, decide, act.
-            """
-            self.cycle_count += 1
-            
-            # Generate sensor report
-            sensor_report = SensorReport()
-            
-            # Check for disasters
-            event = sensor_report.detect_disaster()
-            if event:
-                self.event_queue.append(event)
-            
-            # Run FSM
-            self.log_trace(f"\n{'='*70}")
-            self.log_trace(f"CYCLE #{self.cycle_count} @ {datetime.now().strftime('%H:%M:%S')}")
-            self.log_trace(f"{'='*70}")
-            self.log_trace(f"Current State: {self.state.value}")
-            self.log_trace(f"Current Goal: {self.current_goal.value}")
-            
-            # Display sensor readings
-            self.log_trace(f"\n[SENSOR READINGS]")
-            self.log_trace(f"  Temperature: {sensor_report.temperature:.2f}°C")
-            self.log_trace(f"  Wind Speed: {sensor_report.wind_speed:.2f} km/h")
-            self.log_trace(f"  Water Level: {sensor_report.water_level:.2f} m")
-            self.log_trace(f"  Structural Damage: {sensor_report.structural_damage:.2f}%")
-            
-            # Process events and transition states
-            if self.event_queue:
-                event = self.event_queue.pop(0)
-                self.log_trace(f"\n[EVENT DETECTED] ⚠️  {event}")
-                self.handle_event(event)
-            else:
-                self.log_trace(f"\n[STATUS] ✓ No events detected")
-            
-            # Execute current state behavior
-            self.execute_state_behavior()
-            
-            self.log_trace(f"{'='*70}\n")
-            
-            # Stop after 15 cycles
-            if self.cycle_count >= 15:
-                self.log_trace(f"\n[INFO] Simulation complete. Agent stopping...\n")
-                await self.agent.stop()
-            
-            await asyncio.sleep(2)
-        
-        def handle_event(self, event):
-            """
-            Event-triggered state transitions (FSM logic).
-            """
-            self.log_trace(f"\n[FSM TRANSITION]")
-            
-            if self.state == AgentState.IDLE or self.state == AgentState.MONITORING:
-                # Transition to assessing when disaster detected
-                self.log_trace(f"  {self.state.value} → ASSESSING")
-                self.state = AgentState.ASSESSING
-                self.current_goal = Goal.ASSESS_DAMAGE
-            
-            elif self.state == AgentState.ASSESSING:
-                # Transition based on severity
-                if event.severity == "Critical":
-                    self.log_trace(f"  ASSESSING → RESCUING (Critical severity)")
-                    self.state = AgentState.RESCUING
-                    self.current_goal = Goal.RESCUE_VICTIMS
-                elif event.severity == "High":
-                    self.log_trace(f"  ASSESSING → EVACUATING (High severity)")
-                    self.state = AgentState.EVACUATING
-                    self.current_goal = Goal.EVACUATE_AREA
-                else:
-                    self.log_trace(f"  ASSESSING → RESPONDING (Medium severity)")
-                    self.state = AgentState.RESPONDING
-                    self.current_goal = Goal.COORDINATE_RESPONSE
-            
-            elif self.state in [AgentState.RESPONDING, AgentState.RESCUING, AgentState.EVACUATING]:
-                # Continue with current response or move to recovery
-                if random.random() < 0.3:  # 30% chance to complete
-                    self.log_trace(f"  {self.state.value} → RECOVERY (Task completed)")
-                    self.state = AgentState.RECOVERY
-                    self.current_goal = Goal.COORDINATE_RESPONSE
-                else:
-                    self.log_trace(f"  {self.state.value} → {self.state.value} (Continuing)")
-            
-            elif self.state == AgentState.RECOVERY:
-                # Return to monitoring after recovery
-                self.log_trace(f"  RECOVERY → MONITORING (Recovery complete)")
-                self.state = AgentState.MONITORING
-                self.current_goal = Goal.DETECT_DISASTERS
-        
-        def execute_state_behavior(self):
-            """
-            Execute actions based on current state.
-            """
-            self.log_trace(f"\n[ACTIONS]")
-            
-            if self.state == AgentState.IDLE:
-                self.log_trace(f"  → Initializing systems...")
-                self.state = AgentState.MONITORING
-            
-            elif self.state == AgentState.MONITORING:
-                self.log_trace(f"  → Monitoring environment for disasters")
-                self.log_trace(f"  → Running sensor scans")
-            
-            elif self.state == AgentState.ASSESSING:
-                self.log_trace(f"  → Analyzing disaster impact")
-                self.log_trace(f"  → Determining response priority")
-                self.log_trace(f"  → Calculating resource requirements")
-            
-            elif self.state == AgentState.RESPONDING:
-                self.log_trace(f"  → Deploying emergency response teams")
-                self.log_trace(f"  → Establishing communication channels")
-                self.log_trace(f"  → Coordinating with other agents")
-            
-            elif self.state == AgentState.RESCUING:
-                self.log_trace(f"  → Locating victims")
-                self.log_trace(f"  → Deploying rescue teams")
-                self.log_trace(f"  → Providing medical assistance")
-            
-            elif self.state == AgentState.EVACUATING:
-                self.log_trace(f"  → Issuing evacuation orders")
-                self.log_trace(f"  → Opening evacuation routes")
-                self.log_trace(f"  → Guiding civilians to safety")
-            
-            elif self.state == AgentState.RECOVERY:
-                self.log_trace(f"  → Assessing residual risks")
-                self.log_trace(f"  → Coordinating cleanup operations")
-                self.log_trace(f"  → Preparing for next incident")
-        
-        def log_trace(self, message):
-            """
-            Log execution trace to file and console.
-            """
-            print(message)
-            with open(self.trace_file, "a") as f:
-                f.write(message + "\n")
-    
-    def __init__(self, jid, password, trace_file, verify_security=False):
-        super().__init__(jid, password, verify_security=verify_security)
-        self.trace_file = trace_file
-    
-    async def setup(self):
-        """
-        Initialize the reactive rescue agent.
-        """
-        print(f"\n[SETUP] ReactiveRescueAgent {self.jid} initializing...")
-        print(f"[SETUP] Trace file: {self.trace_file}")
-        
-        # Initialize trace file
-        with open(self.trace_file, "w") as f:
-            f.write("="*70 + "\n")
-            f.write("REACTIVE RESCUE AGENT - EXECUTION TRACE\n")
-            f.write(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("="*70 + "\n\n")
-        
-        # Add FSM behavior
-        fsm = self.FSMBehaviour(trace_file=self.trace_file)
-        self.add_behaviour(fsm)
-        
-        print("[SETUP] FSM behavior activated")
-        print("[SETUP] Starting reactive agent...\n")
+# Sample column holding the reading for each DISASTER_CHECKS entry,
+# plus thresholds and sensor maxes in the same check order
+COLUMN_FOR_CHECK = np.array([0, 2, 1, 3])
+CHECK_THRESHOLDS = np.array([40.0, 5.0, 80.0, 60.0])
+CHECK_MAXES = np.array([50.0, 10.0, 120.0, 100.0])
 
+# Sensor samples scanned per FSM cycle, and the number of rows drawn
+# per refill of the prefilled sample buffer (a multiple of BATCH_SIZE)
+BATCH_SIZE = 8
+SAMPLE_PREFILL = 1024
 
-# ============================================================================
-# MAIN
-# ============================================================================
+RNG = np.random.default_rng()
 
-async def main():
+
+def get_severity(value, min_threshold, max_threshold):
     """
-    Main function to run the reactive agent simulation.
+    Calculate severity level based on sensor value.
     """
-    print("\n" + "="*70)
-    print("LAB 3: GOALS, EVENTS, AND REACTIVE BEHAVIOR")
-    print("="*70)
-    print("Initializing Finite State Machine agent...")
-    print("="*70 + "\n")
-    
-    trace_file = "execution_trace.log"
-    
-    # Create reactive rescue agent
-    # IMPORTANT: Change JID to your unique username!
-    JID = "rescueagent123@404.city"
-    PASSWORD = "rescuepass123"
-    
-    agent = ReactiveRescueAgent(
-        jid=JID,
-        password=PASSWORD,
-        trace_file=trace_file,
-        verify_security=False
-    )
-    
-    # Start the agent
-    await agent.start()
-    print(f"[INFO] ReactiveRescueAgent started: {JID}\n")
-    
-    # Keep running while agent is alive
-    while agent.is_alive():
-        await asyncio.sleep(1)
-    
-    print("\n" + "="*70)
-    print("SIMULATION COMPLETED")
-    print("="*70)
-    print(f"Execution trace saved to: {trace_file}")
-    print("="*70 + "\n")
+    position = (value - min_threshold) / (max_threshold - min_threshold)
+    return SEVERITY_LEVELS[min(2, max(0, int(position * 3)))]
 
 
-if __name__ == "__main__":
-    try:
-        asyncio.run(main())
-    except KeyboardInterrupt:
-        print("\n\n[INFO] Agent stopped by user")
-    except Exception as e:
-        print(f"\n[ERROR] An error occurred: {e}")
-"""
-LAB 3: GOALS, EVENTS, AND REACTIVE BEHAVIOR
-Student: [Your Name]
-Date: January 28, 2026
-
-This program implements:
-1. Rescue and response goals for disaster management
-2. Event-triggered behavior based on sensor reports
-3. Finite State Machine (FSM) for reactive agent behavior
-"""
-
-import asyncio
-import random
-from datetime import datetime
-from enum import Enum
-from spade.agent import Agent
-from spade.behaviour import CyclicBehaviour
-
-
-# ============================================================================
-# FSM STATES AND GOALS
-# ============================================================================
-
-class AgentState(Enum):
+def sample_sensor_batch(n):
     """
-    Finite State Machine states for the rescue agent.
+    Draw n sensor readings in one RNG call as an (n, 4) array.
     """
-    IDLE = "IDLE"
-    MONITORING = "MONITORING"
-    ASSESSING = "ASSESSING"
-    RESPONDING = "RESPONDING"
-    RESCUING = "RESCUING"
-    EVACUATING = "EVACUATING"
-    RECOVERY = "RECOVERY"
+    return RNG.uniform(SENSOR_LOWS, SENSOR_HIGHS, size=(n, 4))
 
 
-class Goal(Enum):
+def detect_disaster_batch(samples):
     """
-    Agent goals for disaster response.
+    Vectorized counterpart of SensorReport.detect_disaster: returns the
+    index into DISASTER_CHECKS fired per row, or -1 where none fired.
     """
-    MAINTAIN_SAFETY = "Maintain Safety"
-    DETECT_DISASTERS = "Detect Disasters"
-    ASSESS_DAMAGE = "Assess Damage"
-    RESCUE_VICTIMS = "Rescue Victims"
-    EVACUATE_AREA = "Evacuate Area"
-    COORDINATE_RESPONSE = "Coordinate Response"
+    mask = samples[:, COLUMN_FOR_CHECK] > CHECK_THRESHOLDS
+    codes = mask.argmax(axis=1)
+    codes[~mask.any(axis=1)] = -1
+    return codes
 
 
-# ============================================================================
-# EVENT CLASSES
-# ============================================================================
-
-class DisasterEvent:
+def events_from_batch(samples, codes, timestamp):
     """
-    Represents a disaster event that triggers agent behavior.
+    Build DisasterEvents for the rows flagged by detect_disaster_batch,
+    with severities bucketed in one vectorized pass.
     """
-    def __init__(self, event_type, severity, location):
-        self.event_type = event_type
-        self.severity = severity
-        self.location = location
-        self.timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    def __str__(self):
-        return f"{self.event_type} (Severity: {self.severity}) at {self.location}"
+    rows = np.nonzero(codes >= 0)[0]
+    if rows.size == 0:
+        return []
+
+    fired = codes[rows]
+    values = samples[rows, COLUMN_FOR_CHECK[fired]]
+    lo = CHECK_THRESHOLDS[fired]
+    hi = CHECK_MAXES[fired]
+    buckets = np.clip(((values - lo) / (hi - lo) * 3).astype(np.int8), 0, 2)
+
+    return [
+        DisasterEvent(DISASTER_CHECKS[c][2], SEVERITY_LEVELS[b], DISASTER_CHECKS[c][3], timestamp)
+        for c, b in zip(fired, buckets)
+    ]
 
 
 class SensorReport:
     """
     Environmental sensor report that can trigger events.
     """
-    def __init__(self):
-        self.temperature = random.uniform(20, 45)
-        self.wind_speed = random.uniform(0, 120)
-        self.water_level = random.uniform(0, 8)
-        self.structural_damage = random.uniform(0, 100)
-        self.timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    __slots__ = ("temperature", "wind_speed", "water_level",
+                 "structural_damage", "timestamp")
+
+    def __init__(self, timestamp=None):
+        # one vectorized draw for all four readings
+        (self.temperature, self.wind_speed,
+         self.water_level, self.structural_damage) = RNG.uniform(SENSOR_LOWS, SENSOR_HIGHS)
+        self.timestamp = timestamp if timestamp is not None else _fmt_now()
     
     def detect_disaster(self):
         """
         Analyze sensor data to detect disaster events.
         Returns DisasterEvent or None.
         """
-        # Check for fire (high temperature)
-        if self.temperature > 40:
-            return DisasterEvent("Fire", self._get_severity(self.temperature, 40, 50), "Fire Zone")
-        
-        # Check for flood (high water level)
-        if self.water_level > 5:
-            return DisasterEvent("Flood", self._get_severity(self.water_level, 5, 10), "Flood Zone")
-        
-        # Check for hurricane (high wind speed)
-        if self.wind_speed > 80:
-            return DisasterEvent("Hurricane", self._get_severity(self.wind_speed, 80, 120), "Storm Zone")
-        
-        # Check for structural collapse (high damage)
-        if self.structural_damage > 60:
-            return DisasterEvent("Building Collapse", self._get_severity(self.structural_damage, 60, 100), "Collapse Zone")
-        
-        return None
-    
-    def _get_severity(self, value, min_threshold, max_threshold):
-        """
-        Calculate severity level based on sensor value.
-        """
-        range_size = max_threshold - min_threshold
-        position = (value - min_threshold) / range_size
-        
-        if position < 0.33:
-            return "Medium"
-        elif position < 0.66:
-            return "High"
-        else:
-            return "Critical"
+        # Fast path out: nothing fired. Conditions ordered by trigger
+        # probability under the sampling ranges, so a live reading
+        # short-circuits after one or two comparisons.
+        if (self.structural_damage <= 60 and self.water_level <= 5
+                and self.wind_speed <= 80 and self.temperature <= 40):
+            return None
+
+        for attr, threshold, event_type, location, sensor_max in DISASTER_CHECKS:
+            value = getattr(self, attr)
+            if value > threshold:
+                severity = get_severity(value, threshold, sensor_max)
+                return DisasterEvent(event_type, severity, location, self.timestamp)
 
 
 # ============================================================================
@@ -472,185 +254,219 @@ class ReactiveRescueAgent(Agent):
     Rescue agent with Finite State Machine for reactive behavior.
     """
     
-    class FSMBehaviour(CyclicBehaviour):
+    class FSMBehaviour(PeriodicBehaviour):
         """
         FSM-based behavior that reacts to events and pursues goals.
         """
-        
-        def __init__(self, trace_file):
-            super().__init__()
-            self.state = AgentState.IDLE
-            self.current_goal = Goal.MAINTAIN_SAFETY
+
+        def __init__(self, period, trace_file):
+            super().__init__(period=period)
+            self.state = IDLE
+            self.current_goal = MAINTAIN_SAFETY
             self.trace_file = trace_file
             self.cycle_count = 0
-            self.event_queue = []
-        
+            self.event_queue = deque()
+            self._buf = []
+            # prefilled sensor samples consumed BATCH_SIZE rows at a time
+            self._sample_buf = sample_sensor_batch(SAMPLE_PREFILL)
+            self._sample_pos = 0
+            # pregenerated Bernoulli(0.3) outcomes for task completion
+            self._completion_rolls = iter(RNG.random(SAMPLE_PREFILL) < 0.3)
+
+        async def on_start(self):
+            # cache the agent's trace handle; it stays open for our lifetime
+            self._trace_fh = self.agent._trace_fh
+
+        async def on_end(self):
+            # don't lose buffered lines if the behaviour is killed mid-cycle
+            if not self._trace_fh.closed:
+                self._flush_trace()
+
+
         async def run(self):
             """
             Main FSM loop: sense, decide, act.
             """
             self.cycle_count += 1
-            
-            # Generate sensor report
-            sensor_report = SensorReport()
-            
-            # Check for disasters
-            event = sensor_report.detect_disaster()
-            if event:
-                self.event_queue.append(event)
+            ts = _fmt_now()
+
+            # Take this cycle's slice of the prefilled samples and scan it
+            samples = self._next_samples()
+            codes = detect_disaster_batch(samples)
+            self.event_queue.extend(events_from_batch(samples, codes, ts))
             
             # Run FSM
-            self.log_trace(f"\n{'='*70}")
-            self.log_trace(f"CYCLE #{self.cycle_count} @ {datetime.now().strftime('%H:%M:%S')}")
-            self.log_trace(f"{'='*70}")
-            self.log_trace(f"Current State: {self.state.value}")
-            self.log_trace(f"Current Goal: {self.current_goal.value}")
-            
-            # Display sensor readings
-            self.log_trace(f"\n[SENSOR READINGS]")
-            self.log_trace(f"  Temperature: {sensor_report.temperature:.2f}°C")
-            self.log_trace(f"  Wind Speed: {sensor_report.wind_speed:.2f} km/h")
-            self.log_trace(f"  Water Level: {sensor_report.water_level:.2f} m")
-            self.log_trace(f"  Structural Damage: {sensor_report.structural_damage:.2f}%")
-            
-            # Process events and transition states
+            self.log_trace("\n" + _BANNER)
+            self.log_trace(f"CYCLE #{self.cycle_count} @ {ts[11:]}")
+            self.log_trace(_BANNER)
+            self.log_trace(f"Current State: {STATE_NAMES[self.state]}")
+            self.log_trace(f"Current Goal: {GOAL_NAMES[self.current_goal]}")
+            
+            # Display the latest sample of this cycle's batch
+            temperature, wind_speed, water_level, structural_damage = samples[-1]
+            self.log_trace(f"\n[SENSOR READINGS] ({BATCH_SIZE} samples/cycle)")
+            self.log_trace(f"  Temperature: {temperature:.2f}°C")
+            self.log_trace(f"  Wind Speed: {wind_speed:.2f} km/h")
+            self.log_trace(f"  Water Level: {water_level:.2f} m")
+            self.log_trace(f"  Structural Damage: {structural_damage:.2f}%")
+            
+            # Drain every queued event this cycle, worst severity first,
+            # rather than aging a backlog one event per cycle
             if self.event_queue:
-                event = self.event_queue.pop(0)
-                self.log_trace(f"\n[EVENT DETECTED] ⚠️  {event}")
-                self.handle_event(event)
+                events = sorted(
+                    self.event_queue,
+                    key=lambda e: SEVERITY_RANK[e.severity],
+                    reverse=True,
+                )
+                self.event_queue.clear()
+                for event in events:
+                    self.log_trace(f"\n[EVENT DETECTED] ⚠️  {event}")
+                    self.handle_event(event)
             else:
                 self.log_trace(f"\n[STATUS] ✓ No events detected")
             
             # Execute current state behavior
             self.execute_state_behavior()
             
-            self.log_trace(f"{'='*70}\n")
-            
+            self.log_trace(_BANNER + "\n")
+
             # Stop after 15 cycles
             if self.cycle_count >= 15:
                 self.log_trace(f"\n[INFO] Simulation complete. Agent stopping...\n")
+                self._flush_trace()
                 await self.agent.stop()
-            
-            await asyncio.sleep(2)
+                return
+
+            self._flush_trace()
         
+        def _next_completion(self):
+            """
+            Next pregenerated completion outcome, refilled in bulk.
+            """
+            try:
+                return next(self._completion_rolls)
+            except StopIteration:
+                self._completion_rolls = iter(RNG.random(SAMPLE_PREFILL) < 0.3)
+                return next(self._completion_rolls)
+
+        def _next_samples(self):
+            """
+            Next BATCH_SIZE rows of sensor samples, refilling the buffer
+            with one large RNG draw when it runs out.
+            """
+            if self._sample_pos >= len(self._sample_buf):
+                self._sample_buf = sample_sensor_batch(SAMPLE_PREFILL)
+                self._sample_pos = 0
+            start = self._sample_pos
+            self._sample_pos += BATCH_SIZE
+            return self._sample_buf[start:self._sample_pos]
+
         def handle_event(self, event):
             """
             Event-triggered state transitions (FSM logic).
             """
-            self.log_trace(f"\n[FSM TRANSITION]")
-            
-            if self.state == AgentState.IDLE or self.state == AgentState.MONITORING:
-                # Transition to assessing when disaster detected
-                self.log_trace(f"  {self.state.value} → ASSESSING")
-                self.state = AgentState.ASSESSING
-                self.current_goal = Goal.ASSESS_DAMAGE
-            
-            elif self.state == AgentState.ASSESSING:
-                # Transition based on severity
-                if event.severity == "Critical":
-                    self.log_trace(f"  ASSESSING → RESCUING (Critical severity)")
-                    self.state = AgentState.RESCUING
-                    self.current_goal = Goal.RESCUE_VICTIMS
-                elif event.severity == "High":
-                    self.log_trace(f"  ASSESSING → EVACUATING (High severity)")
-                    self.state = AgentState.EVACUATING
-                    self.current_goal = Goal.EVACUATE_AREA
-                else:
-                    self.log_trace(f"  ASSESSING → RESPONDING (Medium severity)")
-                    self.state = AgentState.RESPONDING
-                    self.current_goal = Goal.COORDINATE_RESPONSE
-            
-            elif self.state in [AgentState.RESPONDING, AgentState.RESCUING, AgentState.EVACUATING]:
-                # Continue with current response or move to recovery
-                if random.random() < 0.3:  # 30% chance to complete
-                    self.log_trace(f"  {self.state.value} → RECOVERY (Task completed)")
-                    self.state = AgentState.RECOVERY
-                    self.current_goal = Goal.COORDINATE_RESPONSE
-                else:
-                    self.log_trace(f"  {self.state.value} → {self.state.value} (Continuing)")
-            
-            elif self.state == AgentState.RECOVERY:
-                # Return to monitoring after recovery
-                self.log_trace(f"  RECOVERY → MONITORING (Recovery complete)")
-                self.state = AgentState.MONITORING
-                self.current_goal = Goal.DETECT_DISASTERS
-        
+            self.log_trace("\n[FSM TRANSITION]")
+            if self.state in ACTIVE_RESPONSE_STATES:
+                # outcome depends on a completion roll, not the table
+                self._response_progress(event)
+                return
+            self.state, self.current_goal, message = (
+                FSM_TRANSITIONS.get((self.state, event.severity))
+                or FSM_TRANSITIONS[(self.state, "*")]
+            )
+            self.log_trace(message)
+
+        def _response_progress(self, event):
+            # Continue with current response or move to recovery
+            if self._next_completion():  # 30% chance to complete
+                self.log_trace(f"  {STATE_NAMES[self.state]} → RECOVERY (Task completed)")
+                self.state = RECOVERY
+                self.current_goal = COORDINATE_RESPONSE
+            else:
+                self.log_trace(f"  {STATE_NAMES[self.state]} → {STATE_NAMES[self.state]} (Continuing)")
+
         def execute_state_behavior(self):
             """
             Execute actions based on current state.
             """
-            self.log_trace(f"\n[ACTIONS]")
-            
-            if self.state == AgentState.IDLE:
-                self.log_trace(f"  → Initializing systems...")
-                self.state = AgentState.MONITORING
-            
-            elif self.state == AgentState.MONITORING:
-                self.log_trace(f"  → Monitoring environment for disasters")
-                self.log_trace(f"  → Running sensor scans")
-            
-            elif self.state == AgentState.ASSESSING:
-                self.log_trace(f"  → Analyzing disaster impact")
-                self.log_trace(f"  → Determining response priority")
-                self.log_trace(f"  → Calculating resource requirements")
-            
-            elif self.state == AgentState.RESPONDING:
-                self.log_trace(f"  → Deploying emergency response teams")
-                self.log_trace(f"  → Establishing communication channels")
-                self.log_trace(f"  → Coordinating with other agents")
-            
-            elif self.state == AgentState.RESCUING:
-                self.log_trace(f"  → Locating victims")
-                self.log_trace(f"  → Deploying rescue teams")
-                self.log_trace(f"  → Providing medical assistance")
-            
-            elif self.state == AgentState.EVACUATING:
-                self.log_trace(f"  → Issuing evacuation orders")
-                self.log_trace(f"  → Opening evacuation routes")
-                self.log_trace(f"  → Guiding civilians to safety")
-            
-            elif self.state == AgentState.RECOVERY:
-                self.log_trace(f"  → Assessing residual risks")
-                self.log_trace(f"  → Coordinating cleanup operations")
-                self.log_trace(f"  → Preparing for next incident")
+            self.log_trace("\n[ACTIONS]")
+
+            if self.state == IDLE:
+                self.log_trace("  → Initializing systems...")
+                self.state = MONITORING
+                return
+
+            for line in STATE_ACTIONS[self.state]:
+                self.log_trace(line)
         
         def log_trace(self, message):
             """
-            Log execution trace to file and console.
+            Queue an execution trace line for file and console.
             """
-            print(message)
-            with open(self.trace_file, "a") as f:
-                f.write(message + "\n")
-    
+            self._buf.append(message + "\n")
+
+        def _flush_trace(self):
+            """
+            Emit everything buffered this cycle with one write per sink,
+            instead of a console syscall per line plus a file write.
+            """
+            if self._buf:
+                block = "".join(self._buf)
+                sys.stdout.write(block)
+                self._trace_fh.write(block)
+                self._buf.clear()
+
     def __init__(self, jid, password, trace_file, verify_security=False):
         super().__init__(jid, password, verify_security=verify_security)
         self.trace_file = trace_file
+        self._trace_fh = None
+        self.stopped = asyncio.Event()
+
+    async def stop(self):
+        self.stopped.set()
+        if self._trace_fh is not None:
+            self._trace_fh.close()
+            self._trace_fh = None
+        await super().stop()
     
     async def setup(self):
+        """
+        Initialize the reactive rescue agent.
+        """
         print(f"\n[SETUP] ReactiveRescueAgent {self.jid} initializing...")
         print(f"[SETUP] Trace file: {self.trace_file}")
         
-        # trace file
+        # Initialize trace file
         with open(self.trace_file, "w") as f:
             f.write("="*70 + "\n")
             f.write("REACTIVE RESCUE AGENT - EXECUTION TRACE\n")
-            f.write(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"Started: {_fmt_now()}\n")
             f.write("="*70 + "\n\n")
         
-        # FSM behavior
-        fsm = self.FSMBehaviour(trace_file=self.trace_file)
+        # single buffered handle reused by every log_trace call
+        self._trace_fh = open(self.trace_file, "a", buffering=1 << 16)
+
+        # Add FSM behavior
+        fsm = self.FSMBehaviour(period=2.0, trace_file=self.trace_file)
         self.add_behaviour(fsm)
         
         print("[SETUP] FSM behavior activated")
         print("[SETUP] Starting reactive agent...\n")
 
 
-# main 
+# ============================================================================
+# MAIN
+# ============================================================================
 
 async def main():
     """
     Main function to run the reactive agent simulation.
     """
+    # run freshly spawned tasks inline up to their first suspension
+    # (Python 3.12+); SPADE creates many short-lived ones per cycle
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
     print("\n" + "="*70)
     print("LAB 3: GOALS, EVENTS, AND REACTIVE BEHAVIOR")
     print("="*70)
@@ -658,7 +474,7 @@ async def main():
     print("="*70 + "\n")
     
     trace_file = "l3_execution_trace.log"
-    
+
     # Create reactive rescue agent
     JID = "aockiji@xmpp.jp"
     PASSWORD = "40ck1j1@2077"
@@ -674,9 +490,8 @@ async def main():
     await agent.start()
     print(f"[INFO] ReactiveRescueAgent started: {JID}\n")
     
-    # running while agent is alive
-    while agent.is_alive():
-        await asyncio.sleep(1)
+    # Sleep until the agent signals shutdown (no 1s polling wakeups)
+    await agent.stopped.wait()
     
     print("\n" + "="*70)
     print("SIMULATION COMPLETED")
@@ -686,8 +501,25 @@ async def main():
 
 
 if __name__ == "__main__":
+    # prefer uvloop's libuv-based loop when available; drop back to the
+    # stock asyncio loop silently when it isn't installed
     try:
-        asyncio.run(main())
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
+    try:
+        # attach to an already-running loop if there is one, otherwise
+        # drive a fresh one; avoids rebuilding the selector on reruns
+        try:
+            loop = asyncio.get_event_loop()
+            if loop.is_running():
+                loop.create_task(main())
+            else:
+                loop.run_until_complete(main())
+        except RuntimeError:
+            asyncio.run(main())
     except KeyboardInterrupt:
         print("\n\n[INFO] Agent stopped by user")
     except Exception as e: